@@ -1,28 +1,25 @@
 """Configuration loading and validation for SMTP Proxy."""
 
-from dataclasses import dataclass, field
-from pathlib import Path
-import json
+import os
 
+import msgspec
 
-@dataclass
-class TLSConfig:
+
+class TLSConfig(msgspec.Struct, forbid_unknown_fields=True):
     """TLS/STARTTLS configuration."""
     enabled: bool = False
     cert_file: str = "certs/server.crt"
     key_file: str = "certs/server.key"
 
 
-@dataclass
-class AuthConfig:
+class AuthConfig(msgspec.Struct, forbid_unknown_fields=True):
     """SMTP authentication configuration."""
     required: bool = True
     username: str = "mailuser"
     password: str = "mailpass"
 
 
-@dataclass
-class SMTPConfig:
+class SMTPConfig(msgspec.Struct, forbid_unknown_fields=True):
     """SMTP server configuration."""
     host: str = "0.0.0.0"
     port: int = 2525
@@ -32,16 +29,15 @@ class SMTPConfig:
     max_message_bytes: int = 10485760  # 10MB
     max_recipients: int = 50
     allow_insecure_auth: bool = True
-    tls: TLSConfig = field(default_factory=TLSConfig)
-    auth: AuthConfig = field(default_factory=AuthConfig)
+    tls: TLSConfig = msgspec.field(default_factory=TLSConfig)
+    auth: AuthConfig = msgspec.field(default_factory=AuthConfig)
 
     @property
     def address(self) -> str:
         return f"{self.host}:{self.port}"
 
 
-@dataclass
-class WebConfig:
+class WebConfig(msgspec.Struct, forbid_unknown_fields=True):
     """Web server configuration."""
     host: str = "0.0.0.0"
     port: int = 8080
@@ -53,63 +49,35 @@ class WebConfig:
         return f"{self.host}:{self.port}"
 
 
-@dataclass
-class DatabaseConfig:
+class DatabaseConfig(msgspec.Struct, forbid_unknown_fields=True):
     """Database configuration."""
     path: str = "./data/smtp_proxy.db"
+    pool_size: int = 5
 
 
-@dataclass
-class AdminConfig:
+class AdminConfig(msgspec.Struct, forbid_unknown_fields=True):
     """Admin user configuration."""
     username: str = "admin"
     password: str = "changeme"
 
 
-@dataclass
-class Config:
+class Config(msgspec.Struct, forbid_unknown_fields=True):
     """Main application configuration."""
-    smtp: SMTPConfig = field(default_factory=SMTPConfig)
-    web: WebConfig = field(default_factory=WebConfig)
-    database: DatabaseConfig = field(default_factory=DatabaseConfig)
-    admin: AdminConfig = field(default_factory=AdminConfig)
+    smtp: SMTPConfig = msgspec.field(default_factory=SMTPConfig)
+    web: WebConfig = msgspec.field(default_factory=WebConfig)
+    database: DatabaseConfig = msgspec.field(default_factory=DatabaseConfig)
+    admin: AdminConfig = msgspec.field(default_factory=AdminConfig)
 
     @classmethod
     def load(cls, path: str) -> "Config":
         """Load configuration from a JSON file."""
-        config_path = Path(path)
-        if not config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {path}")
-
-        with open(config_path, "r") as f:
-            data = json.load(f)
-
-        return cls._from_dict(data)
-
-    @classmethod
-    def _from_dict(cls, data: dict) -> "Config":
-        """Create Config from a dictionary."""
-        smtp_data = data.get("smtp", {})
-        tls_data = smtp_data.pop("tls", {})
-        auth_data = smtp_data.pop("auth", {})
-
-        smtp_config = SMTPConfig(
-            **smtp_data,
-            tls=TLSConfig(**tls_data),
-            auth=AuthConfig(**auth_data),
-        )
-
-        web_config = WebConfig(**data.get("web", {}))
-        database_config = DatabaseConfig(**data.get("database", {}))
-        admin_config = AdminConfig(**data.get("admin", {}))
-
-        config = cls(
-            smtp=smtp_config,
-            web=web_config,
-            database=database_config,
-            admin=admin_config,
-        )
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {path}") from None
 
+        config = msgspec.json.decode(raw, type=cls)
         config.validate()
         return config
 
@@ -126,6 +94,9 @@ class Config:
         if not self.database.path:
             errors.append("Database path is required")
 
+        if self.database.pool_size < 1:
+            errors.append("Database pool size must be at least 1")
+
         if not self.admin.username:
             errors.append("Admin username is required")
 
@@ -133,10 +104,15 @@ class Config:
             errors.append("Admin password is required")
 
         if self.smtp.tls.enabled:
-            if not Path(self.smtp.tls.cert_file).exists():
-                errors.append(f"TLS certificate file not found: {self.smtp.tls.cert_file}")
-            if not Path(self.smtp.tls.key_file).exists():
-                errors.append(f"TLS key file not found: {self.smtp.tls.key_file}")
+            # One stat syscall per file instead of a Path().exists() round-trip
+            for label, file_path in (
+                ("certificate", self.smtp.tls.cert_file),
+                ("key", self.smtp.tls.key_file),
+            ):
+                try:
+                    os.stat(file_path)
+                except OSError:
+                    errors.append(f"TLS {label} file not found: {file_path}")
 
         if errors:
             raise ValueError("Configuration validation failed:\n" + "\n".join(f"  - {e}" for e in errors))
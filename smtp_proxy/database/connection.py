@@ -1,20 +1,62 @@
 """Database connection and schema initialization."""
 
+import queue
 import sqlite3
-from pathlib import Path
 import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Per-connection tuning, applied as one script so connection setup (and
+# pool warmup in particular) parses and round-trips once instead of per
+# PRAGMA.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+"""
 
 
 class Database:
-    """SQLite database connection manager."""
+    """SQLite connection pool with one writer and N reader connections.
 
-    def __init__(self, path: str):
+    Readers need no Python-level locking: each caller checks a connection
+    out of the pool, WAL lets them run concurrently with the writer, and
+    busy_timeout retries any residual contention inside SQLite itself.
+    Only the single writer connection is guarded by a lock.
+    """
+
+    def __init__(self, path: str, pool_size: int = 5):
         self.path = path
-        self._lock = threading.Lock()
+        self.pool_size = pool_size
+        self._write_lock = threading.Lock()
         self._ensure_directory()
-        self.conn = sqlite3.connect(path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self._writer = self._connect()
         self._init_schema()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._readers.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection configured for pooled use."""
+        # detect_types=0 (the default) is a contract: DATETIME columns are
+        # returned as TEXT and parsed by the repositories.
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+            detect_types=0,
+        )
+        self._configure_connection(conn)
+        return conn
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        """Apply per-connection PRAGMA tuning for concurrent access."""
+        conn.executescript(_CONNECTION_PRAGMAS)
 
     def _ensure_directory(self) -> None:
         """Ensure the database directory exists."""
@@ -36,8 +78,6 @@ class Database:
             sender TEXT NOT NULL,
             recipients TEXT NOT NULL,
             subject TEXT DEFAULT '',
-            body TEXT NOT NULL,
-            raw_message BLOB NOT NULL,
             size_bytes INTEGER NOT NULL,
             received_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             status TEXT DEFAULT 'received',
@@ -45,41 +85,126 @@ class Database:
             client_ip TEXT DEFAULT ''
         );
 
+        CREATE TABLE IF NOT EXISTS emails_body (
+            email_id INTEGER PRIMARY KEY REFERENCES emails(id),
+            body TEXT NOT NULL,
+            raw_message BLOB NOT NULL
+        );
+
         CREATE INDEX IF NOT EXISTS idx_emails_received_at ON emails(received_at DESC);
-        CREATE INDEX IF NOT EXISTS idx_emails_sender ON emails(sender);
-        CREATE INDEX IF NOT EXISTS idx_emails_status ON emails(status);
+        CREATE INDEX IF NOT EXISTS idx_emails_status_received_at ON emails(status, received_at DESC);
+
+        DROP INDEX IF EXISTS idx_emails_sender;
+        DROP INDEX IF EXISTS idx_emails_status;
+
+        ANALYZE;
         """
-        with self._lock:
-            self.conn.executescript(schema)
-            self.conn.commit()
+        with self._write_lock:
+            self._writer.executescript(schema)
+            self._migrate_inline_bodies()
+
+    def _migrate_inline_bodies(self) -> None:
+        """Move body/raw_message out of the emails table for old databases.
+
+        Databases created before the emails_body side table stored both
+        columns inline; relocate them so list-view pages stay small.
+        """
+        columns = {
+            row[1] for row in self._writer.execute("PRAGMA table_info(emails)")
+        }
+        if "raw_message" not in columns:
+            return
+        self._writer.executescript(
+            """
+            BEGIN IMMEDIATE;
+            INSERT OR IGNORE INTO emails_body (email_id, body, raw_message)
+                SELECT id, body, raw_message FROM emails;
+            ALTER TABLE emails DROP COLUMN body;
+            ALTER TABLE emails DROP COLUMN raw_message;
+            COMMIT;
+            """
+        )
+
+    @contextmanager
+    def _checkout_reader(self):
+        """Check a reader connection out of the pool for the current caller."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
 
     def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """Execute a query with thread safety."""
-        with self._lock:
-            cursor = self.conn.execute(query, params)
-            self.conn.commit()
-            return cursor
+        """Execute a write query on the writer connection."""
+        with self._write_lock:
+            return self._writer.execute(query, params)
 
     def executemany(self, query: str, params_list: list[tuple]) -> sqlite3.Cursor:
-        """Execute many queries with thread safety."""
-        with self._lock:
-            cursor = self.conn.executemany(query, params_list)
-            self.conn.commit()
+        """Execute a batched write on the writer connection in one transaction."""
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._writer.executemany(query, params_list)
+            except Exception:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
             return cursor
 
-    def fetchone(self, query: str, params: tuple = ()) -> sqlite3.Row | None:
-        """Fetch one row."""
-        with self._lock:
-            cursor = self.conn.execute(query, params)
+    @contextmanager
+    def transaction(self):
+        """Yield the writer connection inside a BEGIN IMMEDIATE transaction."""
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except Exception:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+
+    def insert_many(self, query: str, params_list: list[tuple]) -> int:
+        """Insert a batch in one transaction and return the first new row ID.
+
+        Row IDs are contiguous because the batch commits inside a single
+        exclusive write transaction.
+        """
+        with self.transaction() as conn:
+            conn.executemany(query, params_list)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return last_id - len(params_list) + 1
+
+    def fetchone(self, query: str, params: tuple = ()) -> tuple | None:
+        """Fetch one row as a tuple using a pooled reader connection."""
+        with self._checkout_reader() as conn:
+            cursor = conn.execute(query, params)
             return cursor.fetchone()
 
-    def fetchall(self, query: str, params: tuple = ()) -> list[sqlite3.Row]:
-        """Fetch all rows."""
-        with self._lock:
-            cursor = self.conn.execute(query, params)
+    def fetchall(self, query: str, params: tuple = ()) -> list[tuple]:
+        """Fetch all rows as tuples using a pooled reader connection."""
+        with self._checkout_reader() as conn:
+            cursor = conn.execute(query, params)
             return cursor.fetchall()
 
+    def iter(self, query: str, params: tuple = (), arraysize: int = 256):
+        """Yield rows incrementally using a pooled reader connection.
+
+        The reader stays checked out until the generator is exhausted or
+        closed, so consume it promptly.
+        """
+        with self._checkout_reader() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                chunk = cursor.fetchmany(arraysize)
+                if not chunk:
+                    break
+                yield from chunk
+
     def close(self) -> None:
-        """Close the database connection."""
-        with self._lock:
-            self.conn.close()
+        """Close the writer and all pooled reader connections."""
+        self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
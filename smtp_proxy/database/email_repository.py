@@ -1,89 +1,319 @@
 """Email repository for database operations."""
 
+import asyncio
 from datetime import datetime
 
 from ..models import Email
 from .connection import Database
 
+# DATETIME columns come back as TEXT (connections run with detect_types=0),
+# so rows always need the parse and never an isinstance check.
+_fromiso = datetime.fromisoformat
+
+try:
+    import zstandard
+except ImportError:  # compression is optional; store raw bytes as-is
+    zstandard = None
+
+# Zstandard frame magic; raw SMTP messages start with ASCII headers, so the
+# prefix unambiguously marks a compressed blob.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_INSERT_EMAIL_SQL = """
+    INSERT INTO emails (sender, recipients, subject, size_bytes,
+                      received_at, status, smtp_auth_user, client_ip)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_EMAIL_BODY_SQL = """
+    INSERT INTO emails_body (email_id, body, raw_message)
+    VALUES (?, ?, ?)
+"""
+
+# Column order is a contract: positional unpacking below depends on it.
+_EMAIL_COLUMNS = (
+    "e.id, e.sender, e.recipients, e.subject, b.body, b.raw_message, "
+    "e.size_bytes, e.received_at, e.status, e.smtp_auth_user, e.client_ip"
+)
+_EMAIL_JOIN = "emails e JOIN emails_body b ON b.email_id = e.id"
+
+_GET_EMAIL_BY_ID_SQL = f"SELECT {_EMAIL_COLUMNS} FROM {_EMAIL_JOIN} WHERE e.id = ?"
+_GET_RAW_MESSAGE_SQL = "SELECT raw_message FROM emails_body WHERE email_id = ?"
+_LIST_EMAILS_PAGE_SQL = """
+    SELECT id, sender, recipients, subject, size_bytes, received_at, status
+    FROM emails ORDER BY received_at DESC LIMIT ? OFFSET ?
+"""
+_GET_ALL_EMAILS_SQL = (
+    f"SELECT {_EMAIL_COLUMNS} FROM {_EMAIL_JOIN} ORDER BY e.received_at DESC"
+)
+_UPDATE_EMAIL_STATUS_SQL = "UPDATE emails SET status = ? WHERE id = ?"
+_DELETE_ALL_EMAILS_SQL = "DELETE FROM emails"
+_DELETE_ALL_BODIES_SQL = "DELETE FROM emails_body"
+_COUNT_EMAILS_SQL = "SELECT COUNT(*) as count FROM emails"
+
+# Batch tuning for the background writer: flush when this many emails are
+# queued or when the flush interval elapses, whichever comes first.
+_BATCH_MAX_SIZE = 64
+_BATCH_FLUSH_SECONDS = 0.02
+
+# Raw messages at or below this size take the batched in-memory path;
+# larger ones are streamed into the blob column chunk by chunk.
+_STREAM_THRESHOLD_BYTES = 1 << 20
+_STREAM_CHUNK_BYTES = 1 << 16
+
+_INSERT_BODY_ZEROBLOB_SQL = """
+    INSERT INTO emails_body (email_id, body, raw_message)
+    VALUES (?, ?, zeroblob(?))
+"""
+
 
 class EmailRepository:
     """Repository for email CRUD operations."""
 
     def __init__(self, db: Database):
         self.db = db
+        self._write_queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
 
     def create(self, email: Email) -> int:
-        """Create a new email and return its ID."""
-        query = """
-            INSERT INTO emails (sender, recipients, subject, body, raw_message,
-                              size_bytes, received_at, status, smtp_auth_user, client_ip)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """Create a new email synchronously and return its ID."""
+        meta, body = self._email_params(email)
+        with self.db.transaction() as conn:
+            cursor = conn.execute(_INSERT_EMAIL_SQL, meta)
+            email_id = cursor.lastrowid
+            conn.execute(_INSERT_EMAIL_BODY_SQL, (email_id, *body))
+        return email_id
+
+    async def create_async(self, email: Email) -> int:
+        """Queue an email for batched insertion and return its ID once committed.
+
+        Falls back to a synchronous insert if the batch writer is not running.
         """
-        cursor = self.db.execute(
-            query,
-            (
-                email.sender,
-                email.recipients_json(),
-                email.subject,
-                email.body,
-                email.raw_message,
-                email.size_bytes,
-                email.received_at.isoformat(),
-                email.status,
-                email.auth_user,
-                email.client_ip,
-            ),
+        if self._write_queue is None:
+            return self.create(email)
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((self._email_params(email), future))
+        return await future
+
+    async def create_from_file(self, email: Email, body_file, size: int) -> int:
+        """Persist an email whose raw message is spooled in a file.
+
+        Small messages (still held in the spool's memory buffer) go through
+        the batched insert path; large ones are written from a worker
+        thread without ever building the full message as one Python bytes.
+        """
+        body_file.seek(0)
+        if size <= _STREAM_THRESHOLD_BYTES:
+            email.raw_message = body_file.read()
+            return await self.create_async(email)
+        return await asyncio.to_thread(self._create_streaming, email, body_file, size)
+
+    def _create_streaming(self, email: Email, body_file, size: int) -> int:
+        """Insert an email, streaming the raw message out of a file."""
+        meta, _ = self._email_params(email)
+        if zstandard is not None:
+            # Compressed output is a fraction of the input, so materializing
+            # it keeps memory bounded; size= records the content size in the
+            # frame header so one-shot decompression keeps working.
+            cobj = zstandard.ZstdCompressor().compressobj(size=size)
+            parts = []
+            while chunk := body_file.read(_STREAM_CHUNK_BYTES):
+                parts.append(cobj.compress(chunk))
+            parts.append(cobj.flush())
+            blob = b"".join(parts)
+            with self.db.transaction() as conn:
+                cursor = conn.execute(_INSERT_EMAIL_SQL, meta)
+                email_id = cursor.lastrowid
+                conn.execute(_INSERT_EMAIL_BODY_SQL, (email_id, email.body, blob))
+            return email_id
+        with self.db.transaction() as conn:
+            cursor = conn.execute(_INSERT_EMAIL_SQL, meta)
+            email_id = cursor.lastrowid
+            conn.execute(_INSERT_BODY_ZEROBLOB_SQL, (email_id, email.body, size))
+            with conn.blobopen("emails_body", "raw_message", email_id) as blob:
+                while chunk := body_file.read(_STREAM_CHUNK_BYTES):
+                    blob.write(chunk)
+        return email_id
+
+    def start_batch_writer(self) -> None:
+        """Start the background task that drains queued inserts in batches."""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._drain_write_queue())
+
+    async def stop_batch_writer(self) -> None:
+        """Stop the background writer, flushing any queued inserts."""
+        if self._writer_task is None:
+            return
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        pending = []
+        while not self._write_queue.empty():
+            pending.append(self._write_queue.get_nowait())
+        if pending:
+            self._flush_batch(pending)
+        self._writer_task = None
+        self._write_queue = None
+
+    async def _drain_write_queue(self) -> None:
+        """Collect queued inserts and commit them in amortized batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + _BATCH_FLUSH_SECONDS
+            while len(batch) < _BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._write_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            self._flush_batch(batch)
+
+    def _flush_batch(self, batch: list[tuple[tuple, asyncio.Future]]) -> None:
+        """Insert a batch of emails in one transaction and resolve futures."""
+        try:
+            with self.db.transaction() as conn:
+                conn.executemany(_INSERT_EMAIL_SQL, [meta for (meta, _), _ in batch])
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(batch) + 1
+                conn.executemany(
+                    _INSERT_EMAIL_BODY_SQL,
+                    [
+                        (first_id + i, *body)
+                        for i, ((_, body), _) in enumerate(batch)
+                    ],
+                )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(first_id + i)
+
+    @staticmethod
+    def _email_params(email: Email) -> tuple[tuple, tuple]:
+        """Build the (metadata, body) parameter tuples for an email INSERT."""
+        meta = (
+            email.sender,
+            email.recipients_text(),
+            email.subject,
+            email.size_bytes,
+            email.received_at.isoformat(),
+            email.status,
+            email.auth_user,
+            email.client_ip,
         )
-        return cursor.lastrowid
+        body = (email.body, _pack_raw(email.raw_message))
+        return meta, body
 
     def get_by_id(self, email_id: int) -> Email | None:
         """Get an email by its ID."""
-        query = "SELECT * FROM emails WHERE id = ?"
-        row = self.db.fetchone(query, (email_id,))
+        row = self.db.fetchone(_GET_EMAIL_BY_ID_SQL, (email_id,))
         if row is None:
             return None
         return self._row_to_email(row)
 
+    def get_raw_message(self, email_id: int) -> bytes | None:
+        """Get only the raw message bytes for an email, loaded on demand."""
+        row = self.db.fetchone(_GET_RAW_MESSAGE_SQL, (email_id,))
+        return _unpack_raw(row[0]) if row else None
+
+    def list_page(self, limit: int, offset: int = 0) -> list[Email]:
+        """Get one page of emails with list-view columns only.
+
+        The returned Email objects carry empty body/raw_message; use
+        get_by_id() or get_raw_message() when the full content is needed.
+        """
+        rows = self.db.fetchall(_LIST_EMAILS_PAGE_SQL, (limit, offset))
+        emails = []
+        for id_, sender, recipients, subject, size_bytes, received_at, status in rows:
+            emails.append(
+                Email(
+                    id=id_,
+                    sender=sender,
+                    recipients_raw=recipients,
+                    subject=subject,
+                    size_bytes=size_bytes,
+                    received_at=_fromiso(received_at),
+                    status=status,
+                )
+            )
+        return emails
+
+    def iter_all(self):
+        """Iterate all emails newest-first without materializing the result set."""
+        _to_email = self._row_to_email
+        for row in self.db.iter(_GET_ALL_EMAILS_SQL):
+            yield _to_email(row)
+
     def get_all(self) -> list[Email]:
         """Get all emails ordered by received_at descending."""
-        query = "SELECT * FROM emails ORDER BY received_at DESC"
-        rows = self.db.fetchall(query)
-        return [self._row_to_email(row) for row in rows]
+        return list(self.iter_all())
 
     def update_status(self, email_id: int, status: str) -> bool:
         """Update the status of an email."""
-        query = "UPDATE emails SET status = ? WHERE id = ?"
-        cursor = self.db.execute(query, (status, email_id))
+        cursor = self.db.execute(_UPDATE_EMAIL_STATUS_SQL, (status, email_id))
         return cursor.rowcount > 0
 
     def delete_all(self) -> int:
         """Delete all emails and return the count of deleted rows."""
-        query = "DELETE FROM emails"
-        cursor = self.db.execute(query)
+        with self.db.transaction() as conn:
+            conn.execute(_DELETE_ALL_BODIES_SQL)
+            cursor = conn.execute(_DELETE_ALL_EMAILS_SQL)
         return cursor.rowcount
 
     def count(self) -> int:
         """Get the total count of emails."""
-        query = "SELECT COUNT(*) as count FROM emails"
-        row = self.db.fetchone(query)
-        return row["count"] if row else 0
-
-    def _row_to_email(self, row) -> Email:
-        """Convert a database row to an Email object."""
-        received_at = row["received_at"]
-        if isinstance(received_at, str):
-            received_at = datetime.fromisoformat(received_at)
+        row = self.db.fetchone(_COUNT_EMAILS_SQL)
+        return row[0] if row else 0
 
+    def _row_to_email(self, row: tuple) -> Email:
+        """Convert a row in _EMAIL_COLUMNS order to an Email object."""
+        (
+            id_,
+            sender,
+            recipients,
+            subject,
+            body,
+            raw_message,
+            size_bytes,
+            received_at,
+            status,
+            auth_user,
+            client_ip,
+        ) = row
         return Email(
-            id=row["id"],
-            sender=row["sender"],
-            recipients=Email.parse_recipients_json(row["recipients"]),
-            subject=row["subject"],
-            body=row["body"],
-            raw_message=row["raw_message"],
-            size_bytes=row["size_bytes"],
-            received_at=received_at,
-            status=row["status"],
-            auth_user=row["smtp_auth_user"],
-            client_ip=row["client_ip"],
+            id_,
+            sender,
+            recipients,
+            subject,
+            body,
+            _unpack_raw(raw_message),
+            size_bytes,
+            _fromiso(received_at),
+            status,
+            auth_user,
+            client_ip,
         )
+
+
+def _pack_raw(raw: bytes) -> bytes:
+    """Compress a raw message for storage when zstandard is available."""
+    if zstandard is not None and raw:
+        return zstandard.compress(raw)
+    return raw
+
+
+def _unpack_raw(blob: bytes) -> bytes:
+    """Decompress a stored raw message if it carries the zstd magic."""
+    if zstandard is not None and blob[:4] == _ZSTD_MAGIC:
+        return zstandard.decompress(blob)
+    return bytes(blob)
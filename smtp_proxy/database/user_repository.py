@@ -2,11 +2,32 @@
 
 import hashlib
 import secrets
+import time
 from datetime import datetime
 
 from ..models import User
 from .connection import Database
 
+# DATETIME columns come back as TEXT (connections run with detect_types=0),
+# so rows always need the parse and never an isinstance check.
+_fromiso = datetime.fromisoformat
+
+_INSERT_USER_SQL = """
+    INSERT INTO users (username, password_hash, created_at)
+    VALUES (?, ?, ?)
+"""
+
+# Column order is a contract: positional unpacking below depends on it.
+_USER_COLUMNS = "id, username, password_hash, created_at"
+
+_GET_USER_BY_USERNAME_SQL = f"SELECT {_USER_COLUMNS} FROM users WHERE username = ?"
+_GET_USER_BY_ID_SQL = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
+_UPDATE_USER_PASSWORD_SQL = "UPDATE users SET password_hash = ? WHERE id = ?"
+
+# User rows change rarely but are looked up on every authenticated request,
+# so cache them in-process for a short TTL.
+_USER_CACHE_TTL_SECONDS = 30.0
+
 
 class UserRepository:
     """Repository for user CRUD operations."""
@@ -15,32 +36,34 @@ class UserRepository:
 
     def __init__(self, db: Database):
         self.db = db
+        self._user_cache: dict[str, tuple[User, float]] = {}
 
     def create(self, username: str, password: str) -> int:
         """Create a new user and return their ID."""
         password_hash = self._hash_password(password)
-        query = """
-            INSERT INTO users (username, password_hash, created_at)
-            VALUES (?, ?, ?)
-        """
         cursor = self.db.execute(
-            query,
+            _INSERT_USER_SQL,
             (username, password_hash, datetime.now().isoformat()),
         )
+        self._user_cache.pop(username, None)
         return cursor.lastrowid
 
     def get_by_username(self, username: str) -> User | None:
-        """Get a user by their username."""
-        query = "SELECT * FROM users WHERE username = ?"
-        row = self.db.fetchone(query, (username,))
+        """Get a user by their username, served from cache when fresh."""
+        cached = self._user_cache.get(username)
+        if cached is not None and time.monotonic() - cached[1] < _USER_CACHE_TTL_SECONDS:
+            return cached[0]
+        row = self.db.fetchone(_GET_USER_BY_USERNAME_SQL, (username,))
         if row is None:
+            self._user_cache.pop(username, None)
             return None
-        return self._row_to_user(row)
+        user = self._row_to_user(row)
+        self._user_cache[username] = (user, time.monotonic())
+        return user
 
     def get_by_id(self, user_id: int) -> User | None:
         """Get a user by their ID."""
-        query = "SELECT * FROM users WHERE id = ?"
-        row = self.db.fetchone(query, (user_id,))
+        row = self.db.fetchone(_GET_USER_BY_ID_SQL, (user_id,))
         if row is None:
             return None
         return self._row_to_user(row)
@@ -62,15 +85,15 @@ class UserRepository:
     def update_password(self, user_id: int, new_password: str) -> bool:
         """Update a user's password."""
         password_hash = self._hash_password(new_password)
-        query = "UPDATE users SET password_hash = ? WHERE id = ?"
-        cursor = self.db.execute(query, (password_hash, user_id))
+        cursor = self.db.execute(_UPDATE_USER_PASSWORD_SQL, (password_hash, user_id))
+        # Cached entries are keyed by username; drop them all on a keyed-by-id
+        # update so the new hash is picked up immediately.
+        self._user_cache.clear()
         return cursor.rowcount > 0
 
     def exists(self, username: str) -> bool:
         """Check if a user with the given username exists."""
-        query = "SELECT 1 FROM users WHERE username = ? LIMIT 1"
-        row = self.db.fetchone(query, (username,))
-        return row is not None
+        return self.get_by_username(username) is not None
 
     def _hash_password(self, password: str) -> str:
         """Hash a password with a random salt using PBKDF2."""
@@ -83,15 +106,7 @@ class UserRepository:
         ).hex()
         return f"{salt}${hash_value}"
 
-    def _row_to_user(self, row) -> User:
-        """Convert a database row to a User object."""
-        created_at = row["created_at"]
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
-
-        return User(
-            id=row["id"],
-            username=row["username"],
-            password_hash=row["password_hash"],
-            created_at=created_at,
-        )
+    def _row_to_user(self, row: tuple) -> User:
+        """Convert a row in _USER_COLUMNS order to a User object."""
+        id_, username, password_hash, created_at = row
+        return User(id_, username, password_hash, _fromiso(created_at))
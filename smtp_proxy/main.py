@@ -5,14 +5,9 @@ import asyncio
 import logging
 import signal
 import sys
-from pathlib import Path
-
-import uvicorn
 
 from .config import Config
 from .database import Database, EmailRepository, UserRepository
-from .smtp import SMTPServer
-from .web import create_app
 
 # Configure logging
 logging.basicConfig(
@@ -45,7 +40,7 @@ def ensure_admin_user(user_repo: UserRepository, username: str, password: str) -
         logger.info(f"Admin user already exists: {username}")
 
 
-async def run_smtp_server(smtp_server: SMTPServer) -> None:
+async def run_smtp_server(smtp_server: "SMTPServer") -> None:
     """Run the SMTP server."""
     try:
         await smtp_server.start()
@@ -59,6 +54,8 @@ class WebServer:
     """Wrapper for Uvicorn server with graceful shutdown support."""
 
     def __init__(self, app, host: str, port: int):
+        import uvicorn
+
         self.config = uvicorn.Config(
             app,
             host=host,
@@ -79,8 +76,13 @@ class WebServer:
 
 async def main_async(config: Config) -> None:
     """Async main function to run both servers."""
+    # Defer the heavy fastapi/starlette/uvicorn import chains until the
+    # config has been validated, so error exits stay fast.
+    from .smtp import SMTPServer
+    from .web import create_app
+
     # Initialize database
-    db = Database(config.database.path)
+    db = Database(config.database.path, pool_size=config.database.pool_size)
     logger.info(f"Database initialized at: {config.database.path}")
 
     # Create repositories
@@ -114,6 +116,9 @@ async def main_async(config: Config) -> None:
             # Windows doesn't support add_signal_handler
             signal.signal(sig, lambda s, f: signal_handler())
 
+    # Start the batched email writer alongside the servers
+    email_repo.start_batch_writer()
+
     # Start servers
     logger.info(f"Starting SMTP server on {config.smtp.address}")
     logger.info(f"Starting Web server on {config.web.address}")
@@ -147,7 +152,8 @@ async def main_async(config: Config) -> None:
                 except asyncio.CancelledError:
                     pass
 
-    # Close database
+    # Flush pending email inserts and close database
+    await email_repo.stop_batch_writer()
     db.close()
     logger.info("Shutdown complete")
 
@@ -156,15 +162,10 @@ def main() -> None:
     """Main entry point."""
     args = parse_args()
 
-    # Load configuration
-    config_path = Path(args.config)
-    if not config_path.exists():
-        logger.error(f"Configuration file not found: {config_path}")
-        sys.exit(1)
-
+    # Load configuration; Config.load raises if the file is missing
     try:
-        config = Config.load(str(config_path))
-        logger.info(f"Configuration loaded from: {config_path}")
+        config = Config.load(args.config)
+        logger.info(f"Configuration loaded from: {args.config}")
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}")
         sys.exit(1)
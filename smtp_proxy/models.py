@@ -2,15 +2,21 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-import json
 
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class Email:
-    """Email model representing a received email."""
+    """Email model representing a received email.
+
+    Recipients are carried in their stored newline-joined form
+    (recipients_raw) and only decoded to a list on first access, so row
+    conversion does no parsing for emails the caller never inspects.
+    """
     id: int = 0
     sender: str = ""
-    recipients: list[str] = field(default_factory=list)
+    recipients_raw: str = ""
     subject: str = ""
     body: str = ""
     raw_message: bytes = b""
@@ -19,18 +25,43 @@ class Email:
     status: str = "received"
     auth_user: str = ""
     client_ip: str = ""
+    _recipients: list[str] | None = field(default=None, init=False, repr=False)
+
+    @property
+    def recipients(self) -> list[str]:
+        """Recipient list, decoded from the stored form on first access."""
+        if self._recipients is None:
+            self._recipients = self.parse_recipients(self.recipients_raw)
+        return self._recipients
+
+    def recipients_text(self) -> str:
+        """Return recipients as a newline-joined string for storage.
 
-    def recipients_json(self) -> str:
-        """Return recipients as a JSON string."""
-        return json.dumps(self.recipients)
+        Addresses cannot contain newlines, so a plain join is unambiguous
+        and far cheaper than JSON encoding.
+        """
+        return self.recipients_raw
 
     @staticmethod
-    def parse_recipients_json(recipients_json: str) -> list[str]:
-        """Parse recipients from a JSON string."""
-        try:
-            return json.loads(recipients_json)
-        except (json.JSONDecodeError, TypeError):
+    def join_recipients(recipients: list[str]) -> str:
+        """Join a recipient list into its stored newline form."""
+        return "\n".join(recipients)
+
+    @staticmethod
+    def parse_recipients(recipients_text: str) -> list[str]:
+        """Parse recipients from their stored newline-joined form.
+
+        Rows written before the newline format are JSON arrays; fall back
+        to JSON decoding for those.
+        """
+        if not recipients_text:
             return []
+        if recipients_text.startswith("["):
+            try:
+                return orjson.loads(recipients_text)
+            except orjson.JSONDecodeError:
+                return []
+        return recipients_text.split("\n")
 
     def recipients_display(self) -> str:
         """Return recipients as a comma-separated string for display."""
@@ -45,7 +76,7 @@ class Email:
         return self.status == "received"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User model for authentication."""
     id: int = 0
@@ -2,13 +2,19 @@
 
 import asyncio
 import logging
+import weakref
 
 from ..config import SMTPConfig
 from ..database.email_repository import EmailRepository
-from .session import SMTPSession
+from .session import SMTPSession, build_ehlo_response, build_ssl_context
 
 logger = logging.getLogger(__name__)
 
+# Stream buffer limit for client connections. The default 64KB limit
+# means a full DATA block read can never be satisfied from one buffer
+# fill; 256KB lets the transport batch more bytes per event-loop pass.
+_STREAM_LIMIT_BYTES = 1 << 18
+
 
 class SMTPServer:
     """Async SMTP server using asyncio."""
@@ -18,7 +24,14 @@ class SMTPServer:
         self.email_repo = email_repo
         self._server: asyncio.Server | None = None
         self._shutdown_event = asyncio.Event()
-        self._active_connections: set[asyncio.StreamWriter] = set()
+        # WeakSet so writers leaked on exception paths are reclaimed by GC
+        # instead of accumulating until shutdown
+        self._active_connections: weakref.WeakSet[asyncio.StreamWriter] = weakref.WeakSet()
+        # One TLS context for all sessions; each STARTTLS handshake reuses
+        # the already-loaded certificate chain
+        self._ssl_context = build_ssl_context(config) if config.tls.enabled else None
+        # EHLO output only depends on startup config; build it once
+        self._ehlo_response = build_ehlo_response(config)
 
     async def start(self) -> None:
         """Start the SMTP server."""
@@ -26,6 +39,7 @@ class SMTPServer:
             self._handle_client,
             self.config.host,
             self.config.port,
+            limit=_STREAM_LIMIT_BYTES,
         )
 
         addr = self._server.sockets[0].getsockname()
@@ -44,7 +58,14 @@ class SMTPServer:
         logger.debug(f"New SMTP connection from {peername}")
 
         self._active_connections.add(writer)
-        session = SMTPSession(self.config, self.email_repo, reader, writer)
+        session = SMTPSession(
+            self.config,
+            self.email_repo,
+            reader,
+            writer,
+            self._ssl_context,
+            self._ehlo_response,
+        )
         try:
             await session.handle()
         except Exception as e:
@@ -64,18 +85,18 @@ class SMTPServer:
         logger.info("Shutting down SMTP server...")
         self._shutdown_event.set()
 
-        # Close all active connections
-        if self._active_connections:
-            logger.info(f"Closing {len(self._active_connections)} active connection(s)...")
-            for writer in list(self._active_connections):
+        # Close all active connections and wait for them concurrently so
+        # shutdown takes at most one timeout instead of one per connection
+        writers = list(self._active_connections)
+        if writers:
+            logger.info(f"Closing {len(writers)} active connection(s)...")
+            for writer in writers:
                 if not writer.is_closing():
                     writer.close()
-            # Wait for connections to close with timeout
-            for writer in list(self._active_connections):
-                try:
-                    await asyncio.wait_for(writer.wait_closed(), timeout=2.0)
-                except (asyncio.TimeoutError, Exception):
-                    pass
+            await asyncio.gather(
+                *(asyncio.wait_for(w.wait_closed(), timeout=2.0) for w in writers),
+                return_exceptions=True,
+            )
             self._active_connections.clear()
 
         if self._server:
@@ -1,16 +1,180 @@
 """SMTP session handler for individual client connections."""
 
 import asyncio
-import base64
+import hmac
+import re
 import ssl
 from datetime import datetime
-from email import message_from_bytes
+from email.parser import BytesFeedParser
 from email.policy import default as email_policy
+from tempfile import SpooledTemporaryFile
+
+try:
+    # SIMD-accelerated base64 (aklomp/libbase64); same call signature
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
 
 from ..config import SMTPConfig
 from ..database.email_repository import EmailRepository
 from ..models import Email
 
+# DATA payloads up to this size stay in memory; larger messages overflow
+# to disk so one big message cannot balloon the process.
+_SPOOL_MAX_MEMORY = 1 << 20
+
+# DATA is read from the socket in blocks of this size and scanned for the
+# terminator with bytes.find instead of waking up once per line.
+_READ_BLOCK_BYTES = 1 << 16
+
+# End-of-data terminator as it appears after a line boundary, for CRLF and
+# bare-LF clients (readline-era behaviour accepted both).
+_TERM_CRLF = b"\n.\r\n"
+_TERM_LF = b"\n.\n"
+
+# Verb dispatch works on the first four raw bytes folded to uppercase by
+# clearing bit 5 of each byte at once (ASCII letters only differ in that
+# bit across cases; non-letters cannot collide into the letter range).
+# Every supported verb except STARTTLS is exactly four letters.
+_VERB_MASK = 0xDFDFDFDF
+_VERB_EHLO = int.from_bytes(b"EHLO", "little")
+_VERB_HELO = int.from_bytes(b"HELO", "little")
+_VERB_AUTH = int.from_bytes(b"AUTH", "little")
+_VERB_MAIL = int.from_bytes(b"MAIL", "little")
+_VERB_RCPT = int.from_bytes(b"RCPT", "little")
+_VERB_DATA = int.from_bytes(b"DATA", "little")
+_VERB_RSET = int.from_bytes(b"RSET", "little")
+_VERB_QUIT = int.from_bytes(b"QUIT", "little")
+_VERB_NOOP = int.from_bytes(b"NOOP", "little")
+_VERB_STAR = int.from_bytes(b"STAR", "little")  # STARTTLS prefix
+
+# Address extraction for MAIL FROM / RCPT TO. Case-insensitive matching
+# here replaces upcasing the whole command line just to locate the verb;
+# the angle-bracket alternative is tried first so ESMTP parameters after
+# the address are ignored.
+_MAIL_FROM_RE = re.compile(r"FROM:\s*(?:<([^>]*)>|(\S+))", re.IGNORECASE)
+_RCPT_TO_RE = re.compile(r"TO:\s*(?:<([^>]*)>|(\S+))", re.IGNORECASE)
+
+# Fixed replies precomputed as wire bytes so the hot paths skip the
+# f-string + encode in _send(); dynamic replies still go through _send().
+RESP_220_TLS = b"220 Ready to start TLS\r\n"
+RESP_221_BYE = b"221 Bye\r\n"
+RESP_235_AUTH_OK = b"235 Authentication successful\r\n"
+RESP_250_OK = b"250 OK\r\n"
+RESP_250_ACCEPTED = b"250 OK: Message accepted\r\n"
+RESP_334_EMPTY = b"334 \r\n"
+RESP_334_USERNAME = b"334 VXNlcm5hbWU6\r\n"  # Base64 "Username:"
+RESP_334_PASSWORD = b"334 UGFzc3dvcmQ6\r\n"  # Base64 "Password:"
+RESP_354_START = b"354 Start mail input; end with <CRLF>.<CRLF>\r\n"
+RESP_421_TIMEOUT = b"421 Timeout\r\n"
+RESP_452_TOO_MANY = b"452 Too many recipients\r\n"
+RESP_500_UNKNOWN = b"500 Unknown command\r\n"
+RESP_501_SYNTAX = b"501 Syntax error\r\n"
+RESP_502_NO_TLS = b"502 STARTTLS not available\r\n"
+RESP_503_BAD_SEQ = b"503 Bad sequence of commands\r\n"
+RESP_504_BAD_MECH = b"504 Unsupported authentication mechanism\r\n"
+RESP_530_AUTH_REQ = b"530 Authentication required\r\n"
+RESP_535_AUTH_FAIL = b"535 Authentication failed\r\n"
+RESP_552_TOO_LARGE = b"552 Message too large\r\n"
+
+
+def build_ssl_context(config: SMTPConfig) -> ssl.SSLContext:
+    """Build the server-side TLS context for STARTTLS upgrades.
+
+    Loading the certificate chain hits the filesystem, so callers should
+    build this once and share it across sessions.
+    """
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+    ssl_context.load_cert_chain(config.tls.cert_file, config.tls.key_file)
+    return ssl_context
+
+
+def build_ehlo_response(config: SMTPConfig) -> bytes:
+    """Build the full EHLO/HELO response as one wire-format payload.
+
+    Everything in the response is fixed at server start, so callers
+    should build it once and share it across sessions.
+    """
+    extensions = [f"250-{config.domain} Hello"]
+
+    if config.auth.required or config.auth.username:
+        extensions.append("250-AUTH PLAIN LOGIN")
+
+    if config.tls.enabled:
+        extensions.append("250-STARTTLS")
+
+    extensions.append(f"250-SIZE {config.max_message_bytes}")
+    extensions.append("250 OK")
+
+    return "\r\n".join(extensions).encode() + b"\r\n"
+
+
+def _decode_part_body(part) -> str:
+    """Decode a message part's text payload.
+
+    base64-encoded parts are decoded directly with the SIMD decoder
+    instead of the email module's scalar loop in get_payload(decode=True);
+    everything else goes through the stdlib path.
+    """
+    cte = (part.get("Content-Transfer-Encoding") or "").strip().lower()
+    if cte == "base64":
+        try:
+            payload = b64decode(part.get_payload(decode=False))
+            charset = part.get_content_charset() or "utf-8"
+            return payload.decode(charset, errors="replace")
+        except Exception:
+            pass
+    try:
+        content = part.get_content()
+        return content if isinstance(content, str) else str(content)
+    except Exception:
+        payload = part.get_payload(decode=True)
+        if isinstance(payload, bytes):
+            return payload.decode("utf-8", errors="replace")
+        return str(payload or "")
+
+
+def _credentials_match(username: str, password: str, auth) -> bool:
+    """Compare submitted credentials in constant time.
+
+    Both comparisons always run (bitwise & instead of short-circuit and)
+    so response timing leaks neither which field was wrong nor any prefix
+    of the configured values.
+    """
+    user_ok = hmac.compare_digest(username.encode(), auth.username.encode())
+    pass_ok = hmac.compare_digest(password.encode(), auth.password.encode())
+    return bool(user_ok & pass_ok)
+
+
+def _extract_subject_body(parser: BytesFeedParser, spool) -> tuple[str, str]:
+    """Finish the incremental parse and pull subject and body text.
+
+    Falls back to decoding the spooled raw message when parsing fails.
+    """
+    subject = ""
+    body = ""
+    try:
+        msg = parser.close()
+        subject = msg.get("Subject", "") or ""
+
+        # Extract body
+        if msg.is_multipart():
+            for part in msg.walk():
+                if part.get_content_type() == "text/plain":
+                    body = _decode_part_body(part)
+                    break
+        else:
+            body = _decode_part_body(msg)
+    except Exception:
+        # If parsing fails, use raw message
+        spool.seek(0)
+        body = spool.read().decode("utf-8", errors="replace")
+
+    if not isinstance(body, str):
+        body = str(body)
+    return subject, body
+
 
 class SMTPSession:
     """Handles a single SMTP client connection."""
@@ -21,11 +185,18 @@ class SMTPSession:
         email_repo: EmailRepository,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
+        ssl_context: ssl.SSLContext | None = None,
+        ehlo_response: bytes | None = None,
     ):
         self.config = config
         self.email_repo = email_repo
         self.reader = reader
         self.writer = writer
+        # Shared by the server across sessions so each STARTTLS does not
+        # re-read the certificate chain; built lazily if not provided.
+        self._ssl_context = ssl_context
+        # Precomputed EHLO payload, likewise shared across sessions.
+        self._ehlo_response = ehlo_response or build_ehlo_response(config)
 
         # Session state
         self.authenticated = False
@@ -33,6 +204,10 @@ class SMTPSession:
         self.mail_from = ""
         self.rcpt_to: list[str] = []
         self.client_ip = ""
+        # Bytes read past the end-of-data terminator by the block reader;
+        # consumed before the socket by _readline() so pipelined commands
+        # sent in the same burst as DATA are not lost.
+        self._leftover = bytearray()
 
     async def handle(self) -> None:
         """Handle the SMTP session."""
@@ -45,20 +220,21 @@ class SMTPSession:
             while True:
                 try:
                     line = await asyncio.wait_for(
-                        self.reader.readline(),
+                        self._readline(),
                         timeout=self.config.read_timeout_seconds,
                     )
                     if not line:
                         break
 
-                    command = line.decode("utf-8", errors="replace").strip()
-                    if not command:
+                    raw = line.strip()
+                    if not raw:
                         continue
 
-                    if not await self._process_command(command):
+                    command = raw.decode("utf-8", errors="replace")
+                    if not await self._process_command(command, raw):
                         break
                 except asyncio.TimeoutError:
-                    await self._send("421 Timeout")
+                    await self._send_bytes(RESP_421_TIMEOUT)
                     break
         except (ConnectionResetError, BrokenPipeError):
             pass
@@ -69,62 +245,51 @@ class SMTPSession:
             except Exception:
                 pass
 
-    async def _process_command(self, line: str) -> bool:
-        """Process a single SMTP command. Returns False to end session."""
-        parts = line.split(None, 1)
-        cmd = parts[0].upper() if parts else ""
-
-        if cmd in ("EHLO", "HELO"):
-            return await self._handle_ehlo(line)
-        elif cmd == "AUTH":
-            return await self._handle_auth(line)
-        elif cmd == "MAIL":
-            return await self._handle_mail(line)
-        elif cmd == "RCPT":
-            return await self._handle_rcpt(line)
-        elif cmd == "DATA":
-            return await self._handle_data()
-        elif cmd == "RSET":
-            return await self._handle_rset()
-        elif cmd == "QUIT":
-            await self._send("221 Bye")
-            return False
-        elif cmd == "NOOP":
-            await self._send("250 OK")
-            return True
-        elif cmd == "STARTTLS":
+    async def _process_command(self, line: str, raw: bytes) -> bool:
+        """Process a single SMTP command. Returns False to end session.
+
+        The verb is identified from the first four raw bytes as one masked
+        integer compare instead of split() + upper() per command; raw is
+        the stripped wire form of line.
+        """
+        head = raw[:4]
+        if len(head) < 4:
+            head = head.ljust(4, b" ")
+        key = int.from_bytes(head, "little") & _VERB_MASK
+
+        # Four-letter verbs must end at the token boundary ("MAILX" is not
+        # MAIL); STARTTLS is the only longer verb and is checked below.
+        if len(raw) == 4 or raw[4:5] in (b" ", b"\t"):
+            handler = self._DISPATCH.get(key)
+            if handler is not None:
+                return await handler(self, line)
+        elif (
+            key == _VERB_STAR
+            and raw[:8].upper() == b"STARTTLS"
+            and (len(raw) == 8 or raw[8:9] in (b" ", b"\t"))
+        ):
             return await self._handle_starttls()
-        else:
-            await self._send("500 Unknown command")
-            return True
+
+        await self._send_bytes(RESP_500_UNKNOWN)
+        return True
 
     async def _handle_ehlo(self, line: str) -> bool:
         """Handle EHLO/HELO command."""
-        extensions = [f"250-{self.config.domain} Hello"]
-
-        if self.config.auth.required or self.config.auth.username:
-            extensions.append("250-AUTH PLAIN LOGIN")
-
-        if self.config.tls.enabled:
-            extensions.append("250-STARTTLS")
-
-        extensions.append(f"250-SIZE {self.config.max_message_bytes}")
-        extensions.append("250 OK")
-
-        for ext in extensions:
-            await self._send(ext)
+        # The whole response is precomputed at server start; replying is
+        # one write + drain.
+        await self._send_bytes(self._ehlo_response)
         return True
 
     async def _handle_auth(self, line: str) -> bool:
         """Handle AUTH command."""
         parts = line.split()
         if len(parts) < 2:
-            await self._send("501 Syntax error")
+            await self._send_bytes(RESP_501_SYNTAX)
             return True
 
         mechanism = parts[1].upper()
         if mechanism not in ("PLAIN", "LOGIN"):
-            await self._send("504 Unsupported authentication mechanism")
+            await self._send_bytes(RESP_504_BAD_MECH)
             return True
 
         if mechanism == "PLAIN":
@@ -137,19 +302,19 @@ class SMTPSession:
         if len(parts) == 3:
             credentials = parts[2]
         else:
-            await self._send("334 ")
+            await self._send_bytes(RESP_334_EMPTY)
             try:
                 cred_line = await asyncio.wait_for(
-                    self.reader.readline(),
+                    self._readline(),
                     timeout=self.config.read_timeout_seconds,
                 )
                 credentials = cred_line.decode().strip()
             except asyncio.TimeoutError:
-                await self._send("421 Timeout")
+                await self._send_bytes(RESP_421_TIMEOUT)
                 return False
 
         try:
-            decoded = base64.b64decode(credentials).decode()
+            decoded = b64decode(credentials).decode()
             # Format: \0username\0password or identity\0username\0password
             parts = decoded.split("\0")
             if len(parts) >= 3:
@@ -159,220 +324,250 @@ class SMTPSession:
             else:
                 raise ValueError("Invalid credentials format")
 
-            if (
-                username == self.config.auth.username
-                and password == self.config.auth.password
+            if _credentials_match(
+                username, password, self.config.auth
             ):
                 self.authenticated = True
                 self.auth_user = username
-                await self._send("235 Authentication successful")
+                await self._send_bytes(RESP_235_AUTH_OK)
                 return True
         except Exception:
             pass
 
-        await self._send("535 Authentication failed")
+        await self._send_bytes(RESP_535_AUTH_FAIL)
         return True
 
     async def _handle_auth_login(self) -> bool:
         """Handle AUTH LOGIN mechanism."""
         try:
             # Send username prompt
-            await self._send("334 VXNlcm5hbWU6")  # Base64 "Username:"
+            await self._send_bytes(RESP_334_USERNAME)
             username_line = await asyncio.wait_for(
-                self.reader.readline(),
+                self._readline(),
                 timeout=self.config.read_timeout_seconds,
             )
-            username = base64.b64decode(username_line.strip()).decode()
+            username = b64decode(username_line.strip()).decode()
 
             # Send password prompt
-            await self._send("334 UGFzc3dvcmQ6")  # Base64 "Password:"
+            await self._send_bytes(RESP_334_PASSWORD)
             password_line = await asyncio.wait_for(
-                self.reader.readline(),
+                self._readline(),
                 timeout=self.config.read_timeout_seconds,
             )
-            password = base64.b64decode(password_line.strip()).decode()
+            password = b64decode(password_line.strip()).decode()
 
-            if (
-                username == self.config.auth.username
-                and password == self.config.auth.password
+            if _credentials_match(
+                username, password, self.config.auth
             ):
                 self.authenticated = True
                 self.auth_user = username
-                await self._send("235 Authentication successful")
+                await self._send_bytes(RESP_235_AUTH_OK)
                 return True
         except Exception:
             pass
 
-        await self._send("535 Authentication failed")
+        await self._send_bytes(RESP_535_AUTH_FAIL)
         return True
 
     async def _handle_mail(self, line: str) -> bool:
         """Handle MAIL FROM command."""
         if self.config.auth.required and not self.authenticated:
-            await self._send("530 Authentication required")
+            await self._send_bytes(RESP_530_AUTH_REQ)
             return True
 
-        upper_line = line.upper()
-        if "FROM:" not in upper_line:
-            await self._send("501 Syntax error")
+        match = _MAIL_FROM_RE.search(line)
+        if match is None:
+            await self._send_bytes(RESP_501_SYNTAX)
             return True
 
-        # Extract address after FROM:
-        idx = upper_line.index("FROM:")
-        addr = line[idx + 5 :].strip()
-
-        # Handle SIZE parameter
-        if " " in addr:
-            addr = addr.split()[0]
-
-        # Remove angle brackets
-        if addr.startswith("<") and addr.endswith(">"):
-            addr = addr[1:-1]
-
-        self.mail_from = addr
-        await self._send("250 OK")
+        bracketed, bare = match.groups()
+        self.mail_from = bracketed if bracketed is not None else bare
+        await self._send_bytes(RESP_250_OK)
         return True
 
     async def _handle_rcpt(self, line: str) -> bool:
         """Handle RCPT TO command."""
         if self.config.auth.required and not self.authenticated:
-            await self._send("530 Authentication required")
+            await self._send_bytes(RESP_530_AUTH_REQ)
             return True
 
         if len(self.rcpt_to) >= self.config.max_recipients:
-            await self._send("452 Too many recipients")
+            await self._send_bytes(RESP_452_TOO_MANY)
             return True
 
-        upper_line = line.upper()
-        if "TO:" not in upper_line:
-            await self._send("501 Syntax error")
+        match = _RCPT_TO_RE.search(line)
+        if match is None:
+            await self._send_bytes(RESP_501_SYNTAX)
             return True
 
-        # Extract address after TO:
-        idx = upper_line.index("TO:")
-        addr = line[idx + 3 :].strip()
-
-        # Remove angle brackets
-        if addr.startswith("<") and addr.endswith(">"):
-            addr = addr[1:-1]
-
-        self.rcpt_to.append(addr)
-        await self._send("250 OK")
+        bracketed, bare = match.groups()
+        self.rcpt_to.append(bracketed if bracketed is not None else bare)
+        await self._send_bytes(RESP_250_OK)
         return True
 
-    async def _handle_data(self) -> bool:
+    async def _handle_data(self, line: str = "") -> bool:
         """Handle DATA command."""
         if self.config.auth.required and not self.authenticated:
-            await self._send("530 Authentication required")
+            await self._send_bytes(RESP_530_AUTH_REQ)
             return True
 
         if not self.mail_from or not self.rcpt_to:
-            await self._send("503 Bad sequence of commands")
+            await self._send_bytes(RESP_503_BAD_SEQ)
             return True
 
-        await self._send("354 Start mail input; end with <CRLF>.<CRLF>")
-
-        data = []
+        await self._send_bytes(RESP_354_START)
+
+        # Feed the parser as blocks arrive so no second full-message parse
+        # pass is needed after the terminator; raw bytes go to the spool
+        # instead of one retained in-memory buffer.
+        parser = BytesFeedParser(policy=email_policy)
+        spool = SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+        # Seeded with a newline so a terminator or stuffed dot at the very
+        # start of the payload still sits on a line boundary; the seed is
+        # dropped from the first flushed block.
+        buf = bytearray(b"\n")
+        if self._leftover:
+            buf += self._leftover
+            self._leftover.clear()
+        seed_pending = True
         total_size = 0
 
-        while True:
-            try:
-                line = await asyncio.wait_for(
-                    self.reader.readline(),
-                    timeout=self.config.read_timeout_seconds,
-                )
-            except asyncio.TimeoutError:
-                await self._send("421 Timeout")
-                return False
+        try:
+            # Hot-loop bindings: every name resolved per iteration below is
+            # hoisted to a local so the block loop pays no attribute or
+            # global lookups between reads.
+            buf_find = buf.find
+            buf_rfind = buf.rfind
+            parser_feed = parser.feed
+            spool_write = spool.write
+            reader_read = self.reader.read
+            wait_for = asyncio.wait_for
+            read_timeout = self.config.read_timeout_seconds
+            max_bytes = self.config.max_message_bytes
 
-            # Check for end of data
-            if line in (b".\r\n", b".\n"):
-                break
+            while True:
+                i = buf_find(_TERM_CRLF)
+                j = buf_find(_TERM_LF)
+                if i >= 0 and (j < 0 or i < j):
+                    end, term_len = i, len(_TERM_CRLF)
+                elif j >= 0:
+                    end, term_len = j, len(_TERM_LF)
+                else:
+                    end = -1
+
+                # memoryview slices avoid an intermediate bytearray copy;
+                # replace() is the only full pass over the block and also
+                # returns its input unchanged when nothing is stuffed.
+                view = memoryview(buf)
+                if end >= 0:
+                    block = bytes(view[: end + 1]).replace(b"\n..", b"\n.")
+                    leftover = bytes(view[end + term_len :])
+                    view.release()
+                else:
+                    # Flush only up to the last line boundary so a stuffed
+                    # dot or terminator split across reads stays intact.
+                    safe = buf_rfind(b"\n")
+                    if safe > 0:
+                        block = bytes(view[:safe]).replace(b"\n..", b"\n.")
+                        view.release()
+                        del buf[:safe]
+                    else:
+                        view.release()
+                        block = b""
+
+                if seed_pending and block:
+                    block = block[1:]
+                    seed_pending = False
+
+                if block:
+                    total_size += len(block)
+                    if total_size > max_bytes:
+                        await self._send_bytes(RESP_552_TOO_LARGE)
+                        self._reset_transaction()
+                        return True
+                    parser_feed(block)
+                    spool_write(block)
+
+                if end >= 0:
+                    self._leftover += leftover
+                    break
 
-            # Dot-stuffing: remove leading dot if doubled
-            if line.startswith(b".."):
-                line = line[1:]
+                # A payload with no newlines at all never flushes, so bound
+                # the staging buffer against the size limit too.
+                if total_size + len(buf) - 1 > max_bytes:
+                    await self._send_bytes(RESP_552_TOO_LARGE)
+                    self._reset_transaction()
+                    return True
 
-            total_size += len(line)
-            if total_size > self.config.max_message_bytes:
-                await self._send("552 Message too large")
-                self._reset_transaction()
-                return True
+                try:
+                    chunk = await wait_for(
+                        reader_read(_READ_BLOCK_BYTES),
+                        timeout=read_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    await self._send_bytes(RESP_421_TIMEOUT)
+                    return False
+                if not chunk:
+                    return False
+                buf += chunk
+
+            # Finishing the parse and decoding bodies is pure CPU work that
+            # can stall every other session on a large message, so it runs
+            # in a worker thread.
+            subject, body = await asyncio.to_thread(
+                _extract_subject_body, parser, spool
+            )
 
-            data.append(line)
+            email = Email(
+                sender=self.mail_from,
+                recipients_raw=Email.join_recipients(self.rcpt_to),
+                subject=subject,
+                body=body,
+                size_bytes=total_size,
+                received_at=datetime.now(),
+                status="received",
+                auth_user=self.auth_user,
+                client_ip=self.client_ip,
+            )
 
-        raw_message = b"".join(data)
+            await self.email_repo.create_from_file(email, spool, total_size)
+        finally:
+            spool.close()
 
-        # Parse email
-        subject = ""
-        body = ""
-        try:
-            msg = message_from_bytes(raw_message, policy=email_policy)
-            subject = msg.get("Subject", "") or ""
-
-            # Extract body
-            if msg.is_multipart():
-                for part in msg.walk():
-                    content_type = part.get_content_type()
-                    if content_type == "text/plain":
-                        try:
-                            body = part.get_content()
-                        except Exception:
-                            body = str(part.get_payload(decode=True) or "")
-                        break
-            else:
-                try:
-                    body = msg.get_content()
-                except Exception:
-                    payload = msg.get_payload(decode=True)
-                    body = payload.decode("utf-8", errors="replace") if payload else ""
-        except Exception:
-            # If parsing fails, use raw message
-            body = raw_message.decode("utf-8", errors="replace")
-
-        if not isinstance(body, str):
-            body = str(body)
-
-        email = Email(
-            sender=self.mail_from,
-            recipients=self.rcpt_to.copy(),
-            subject=subject,
-            body=body,
-            raw_message=raw_message,
-            size_bytes=len(raw_message),
-            received_at=datetime.now(),
-            status="received",
-            auth_user=self.auth_user,
-            client_ip=self.client_ip,
-        )
-
-        self.email_repo.create(email)
-        await self._send("250 OK: Message accepted")
+        await self._send_bytes(RESP_250_ACCEPTED)
 
         self._reset_transaction()
         return True
 
-    async def _handle_rset(self) -> bool:
+    async def _handle_rset(self, line: str = "") -> bool:
         """Handle RSET command."""
         self._reset_transaction()
-        await self._send("250 OK")
+        await self._send_bytes(RESP_250_OK)
+        return True
+
+    async def _handle_quit(self, line: str = "") -> bool:
+        """Handle QUIT command."""
+        await self._send_bytes(RESP_221_BYE)
+        return False
+
+    async def _handle_noop(self, line: str = "") -> bool:
+        """Handle NOOP command."""
+        await self._send_bytes(RESP_250_OK)
         return True
 
     async def _handle_starttls(self) -> bool:
         """Handle STARTTLS command."""
         if not self.config.tls.enabled:
-            await self._send("502 STARTTLS not available")
+            await self._send_bytes(RESP_502_NO_TLS)
             return True
 
-        await self._send("220 Ready to start TLS")
+        await self._send_bytes(RESP_220_TLS)
 
         try:
-            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-            ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-            ssl_context.load_cert_chain(
-                self.config.tls.cert_file,
-                self.config.tls.key_file,
-            )
+            ssl_context = self._ssl_context
+            if ssl_context is None:
+                ssl_context = build_ssl_context(self.config)
+                self._ssl_context = ssl_context
 
             # Upgrade connection to TLS
             transport = self.writer.transport
@@ -399,15 +594,51 @@ class SMTPSession:
 
         return True
 
+    async def _readline(self) -> bytes:
+        """Read one line, draining any bytes carried over from a block read."""
+        buf = self._leftover
+        if buf:
+            nl = buf.find(b"\n")
+            if nl >= 0:
+                line = bytes(buf[: nl + 1])
+                del buf[: nl + 1]
+                return line
+            head = bytes(buf)
+            buf.clear()
+            return head + await self.reader.readline()
+        return await self.reader.readline()
+
     def _reset_transaction(self) -> None:
         """Reset the current mail transaction."""
         self.mail_from = ""
         self.rcpt_to = []
 
     async def _send(self, message: str) -> None:
-        """Send a response to the client."""
+        """Send a dynamically built response to the client."""
         try:
             self.writer.write(f"{message}\r\n".encode())
             await self.writer.drain()
         except (ConnectionResetError, BrokenPipeError):
             pass
+
+    async def _send_bytes(self, payload: bytes) -> None:
+        """Send a precomputed wire-format response to the client."""
+        try:
+            self.writer.write(payload)
+            await self.writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+    # Four-letter verb keys to their handlers; every handler takes the
+    # decoded command line and returns False to end the session.
+    _DISPATCH = {
+        _VERB_EHLO: _handle_ehlo,
+        _VERB_HELO: _handle_ehlo,
+        _VERB_AUTH: _handle_auth,
+        _VERB_MAIL: _handle_mail,
+        _VERB_RCPT: _handle_rcpt,
+        _VERB_DATA: _handle_data,
+        _VERB_RSET: _handle_rset,
+        _VERB_QUIT: _handle_quit,
+        _VERB_NOOP: _handle_noop,
+    }
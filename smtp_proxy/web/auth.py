@@ -1,5 +1,7 @@
 """Session management using signed cookies."""
 
+import hashlib
+
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from fastapi import Request, Response
 
@@ -8,7 +10,12 @@ class SessionManager:
     """Manages user sessions using signed cookies."""
 
     def __init__(self, secret: str, cookie_name: str, max_age: int = 86400):
-        self.serializer = URLSafeTimedSerializer(secret)
+        # SHA-256 instead of the HMAC-SHA1 default: cookie verification
+        # runs on every authenticated request, and CPython's OpenSSL-backed
+        # sha256 uses the CPU's SHA extensions where present.
+        self.serializer = URLSafeTimedSerializer(
+            secret, signer_kwargs={"digest_method": hashlib.sha256}
+        )
         self.cookie_name = cookie_name
         self.max_age = max_age
 
@@ -27,15 +34,25 @@ class SessionManager:
         )
 
     def get_session(self, request: Request) -> dict | None:
-        """Get session data from the request cookie."""
-        token = request.cookies.get(self.cookie_name)
-        if not token:
-            return None
+        """Get session data from the request cookie.
+
+        The verified result (including a failed or missing cookie) is
+        cached on request.state, so a request that consults the session
+        more than once pays for signature verification only once.
+        """
         try:
-            data = self.serializer.loads(token, max_age=self.max_age)
-            return data
-        except (BadSignature, SignatureExpired):
-            return None
+            return request.state.session_data
+        except AttributeError:
+            pass
+        data = None
+        token = request.cookies.get(self.cookie_name)
+        if token:
+            try:
+                data = self.serializer.loads(token, max_age=self.max_age)
+            except (BadSignature, SignatureExpired):
+                data = None
+        request.state.session_data = data
+        return data
 
     def destroy_session(self, response: Response) -> None:
         """Destroy the session by deleting the cookie."""
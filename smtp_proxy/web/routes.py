@@ -1,7 +1,9 @@
 """Web routes for the SMTP Proxy UI."""
 
-from fastapi import APIRouter, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+import asyncio
+
+from fastapi import APIRouter, Request, Form, HTTPException, Response
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 
 from .auth import SessionManager
 from ..database.email_repository import EmailRepository
@@ -9,6 +11,16 @@ from ..database.user_repository import UserRepository
 
 router = APIRouter()
 
+# Unauthenticated hits on every protected route end in this redirect, so
+# skip RedirectResponse's URL quoting and build it from a shared headers
+# mapping instead.
+_LOGIN_REDIRECT_HEADERS = {"location": "/login"}
+
+
+def _login_redirect() -> Response:
+    """Build the 303 redirect to the login page."""
+    return Response(status_code=303, headers=_LOGIN_REDIRECT_HEADERS)
+
 
 def get_session_manager(request: Request) -> SessionManager:
     """Get session manager from app state."""
@@ -65,7 +77,11 @@ async def login_submit(
     templates = request.app.state.templates
 
     user = user_repo.get_by_username(username)
-    if not user or not user_repo.verify_password(user, password):
+    # PBKDF2 burns ~100ms of CPU; run it in a thread so the event loop
+    # keeps serving other requests during verification.
+    if not user or not await asyncio.to_thread(
+        user_repo.verify_password, user, password
+    ):
         return templates.TemplateResponse(
             "login.html",
             {"request": request, "error": "Invalid username or password"},
@@ -81,7 +97,7 @@ async def login_submit(
 async def logout(request: Request):
     """Log out the current user."""
     session_manager = get_session_manager(request)
-    response = RedirectResponse("/login", status_code=303)
+    response = _login_redirect()
     session_manager.destroy_session(response)
     return response
 
@@ -92,33 +108,46 @@ async def root(request: Request):
     try:
         require_auth(request)
     except HTTPException:
-        return RedirectResponse("/login", status_code=303)
+        return _login_redirect()
     return RedirectResponse("/emails", status_code=303)
 
 
 @router.get("/emails", response_class=HTMLResponse)
-async def email_list(request: Request):
-    """Display the list of all emails."""
+async def email_list(request: Request, page: int = 1, page_size: int = 50):
+    """Display one page of received emails."""
     try:
         session = require_auth(request)
     except HTTPException:
-        return RedirectResponse("/login", status_code=303)
+        return _login_redirect()
 
     email_repo = get_email_repo(request)
     templates = request.app.state.templates
 
-    emails = email_repo.get_all()
-    email_count = len(emails)
-
-    return templates.TemplateResponse(
-        "emails.html",
+    # One page of list-view rows (no bodies) plus a COUNT(*) instead of
+    # hydrating the whole mailbox for every hit.
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 200)
+    email_count = email_repo.count()
+    total_pages = max((email_count + page_size - 1) // page_size, 1)
+    emails = email_repo.list_page(page_size, (page - 1) * page_size)
+
+    # Stream the render instead of building the whole page string first:
+    # chunks go out as Jinja produces them, so time-to-first-byte and peak
+    # memory stay flat as the table grows.
+    template = templates.get_template("emails.html")
+    stream = template.stream(
         {
             "request": request,
             "emails": emails,
             "email_count": email_count,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
             "username": session.get("username"),
-        },
+        }
     )
+    stream.enable_buffering(16)
+    return StreamingResponse(stream, media_type="text/html")
 
 
 @router.get("/emails/{email_id}", response_class=HTMLResponse)
@@ -127,7 +156,7 @@ async def email_detail(request: Request, email_id: int):
     try:
         session = require_auth(request)
     except HTTPException:
-        return RedirectResponse("/login", status_code=303)
+        return _login_redirect()
 
     email_repo = get_email_repo(request)
     templates = request.app.state.templates
@@ -152,7 +181,7 @@ async def mark_email_read(request: Request, email_id: int):
     try:
         require_auth(request)
     except HTTPException:
-        return RedirectResponse("/login", status_code=303)
+        return _login_redirect()
 
     email_repo = get_email_repo(request)
     email_repo.update_status(email_id, "read")
@@ -166,7 +195,7 @@ async def wipe_emails(request: Request):
     try:
         require_auth(request)
     except HTTPException:
-        return RedirectResponse("/login", status_code=303)
+        return _login_redirect()
 
     email_repo = get_email_repo(request)
     email_repo.delete_all()